@@ -1,6 +1,8 @@
 __version__ = "0.13.0"
 
+import fnmatch
 import os
+import re
 from collections.abc import Sequence
 from pathlib import Path
 from typing import cast
@@ -148,6 +150,7 @@ def setup(app: Sphinx):
     app.connect("builder-inited", set_up_execution_data)
     app.connect("builder-inited", set_render_priority)
     app.connect("env-purge-doc", remove_execution_data)
+    app.connect("env-merge-info", merge_execution_data)
     app.connect("env-get-outdated", update_execution_cache)
     app.connect("config-inited", add_exclude_patterns)
     app.connect("config-inited", update_togglebutton_classes)
@@ -171,9 +174,7 @@ def setup(app: Sphinx):
     # execution statistics table
     setup_exec_table(app)
 
-    # TODO need to deal with key clashes in NbGlueDomain.merge_domaindata
-    # before this is parallel_read_safe
-    return {"version": __version__, "parallel_read_safe": False}
+    return {"version": __version__, "parallel_read_safe": True}
 
 
 class MystNbConfigError(SphinxError):
@@ -324,11 +325,29 @@ def set_valid_execution_paths(app: Sphinx):
 
     Patterns given in execution_excludepatterns conf variable from executing.
     """
-    app.env.nb_excluded_exec_paths = {
+    patterns = app.config["execution_excludepatterns"]
+    # patterns on the file name alone are compiled into a single regex,
+    # so that the tree is walked once, rather than once per pattern
+    name_patterns = [
+        pat for pat in patterns if not ({"/", os.sep} & set(pat) or "**" in pat)
+    ]
+    excluded = set()
+    if name_patterns:
+        name_regex = re.compile(
+            "|".join(fnmatch.translate(os.path.normcase(pat)) for pat in name_patterns)
+        )
+        excluded.update(
+            str(path)
+            for path in Path().cwd().rglob("*")
+            if name_regex.match(os.path.normcase(path.name))
+        )
+    excluded.update(
         str(path)
-        for pat in app.config["execution_excludepatterns"]
+        for pat in patterns
+        if pat not in name_patterns
         for path in Path().cwd().rglob(pat)
-    }
+    )
+    app.env.nb_excluded_exec_paths = excluded
     LOGGER.verbose("MyST-NB: Excluded Paths: %s", app.env.nb_excluded_exec_paths)
     app.env.nb_allowed_exec_suffixes = {
         suffix
@@ -352,6 +371,16 @@ def remove_execution_data(app: Sphinx, env, docname):
         app.env.nb_execution_data_changed = True
 
 
+def merge_execution_data(app: Sphinx, env, docnames, other):
+    """Merge the execution data from a subprocess, in parallel builds."""
+    for docname in docnames:
+        if docname in other.nb_execution_data:
+            env.nb_execution_data[docname] = other.nb_execution_data[docname]
+            env.nb_execution_data_changed = True
+    if other.nb_contains_widgets:
+        env.nb_contains_widgets = True
+
+
 def add_nb_custom_formats(app: Sphinx, config):
     """Add custom conversion formats."""
     for suffix in config.nb_custom_formats:
@@ -378,7 +407,9 @@ def update_togglebutton_classes(app: Sphinx, config):
 
 
 def save_glue_cache(app: Sphinx, env):
-    NbGlueDomain.from_env(env).write_cache()
+    glue_domain = NbGlueDomain.from_env(env)
+    glue_domain.remove_unused_outputs()
+    glue_domain.write_cache()
 
 
 class JupyterDownloadRole(ReferenceRole):
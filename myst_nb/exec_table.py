@@ -24,6 +24,7 @@ def setup_exec_table(app):
     app.add_post_transform(ExecutionStatsPostTransform)
     app.connect("builder-inited", add_doc_tracker)
     app.connect("env-purge-doc", remove_doc)
+    app.connect("env-merge-info", merge_doc_tracker)
     app.connect("env-updated", update_exec_tables)
 
 
@@ -39,6 +40,12 @@ def remove_doc(app, env, docname):
     env.docs_with_exec_table.discard(docname)
 
 
+def merge_doc_tracker(app, env, docnames, other):
+    env.docs_with_exec_table.update(
+        docname for docname in docnames if docname in other.docs_with_exec_table
+    )
+
+
 def update_exec_tables(app, env):
     """If the execution data has changed,
     this callback adds the list of documents containing an `nb-exec-table` directive
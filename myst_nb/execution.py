@@ -9,22 +9,28 @@ The primary methods in this module are:
   or if 'auto' / 'force' is set, will execute the notebook.
 
 """
+import json
 import os
 import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import List, Optional, Set
 
 import nbformat as nbf
 from jupyter_cache import get_cache
+from jupyter_cache.base import JupyterCacheAbstract
 from jupyter_cache.executors import load_executor
+from jupyter_cache.executors.basic import JupyterExecutorBasic
 from jupyter_cache.executors.utils import single_nb_execution
 from sphinx.application import Sphinx
 from sphinx.builders import Builder
 from sphinx.environment import BuildEnvironment
 from sphinx.util import logging, progress_message
 
-from .converter import get_nb_converter
+from .converter import NOTEBOOK_VERSION, get_nb_converter
 
 LOGGER = logging.getLogger(__name__)
 
@@ -40,45 +46,53 @@ def update_execution_cache(
     and should be re-read.
 
     """
-    # all the added and changed notebooks should be operated on.
-    # note docnames are paths relative to the sphinx root folder, with no extensions
-    altered_docnames = added.union(changed)
-
-    exec_docnames = [
-        docname for docname in altered_docnames if is_valid_exec_file(app.env, docname)
-    ]
-    LOGGER.verbose("MyST-NB: Potential docnames to execute: %s", exec_docnames)
-
-    if app.config["jupyter_execute_notebooks"] == "cache":
-
-        app.env.nb_path_to_cache = str(
-            app.config["jupyter_cache"]
+    # the cache is only reused within a build,
+    # since its folder may be removed between builds (e.g. when cleaning `_build`)
+    _get_cache_base.cache_clear()
+
+    config = app.config
+    if config["jupyter_execute_notebooks"] == "cache":
+
+        env = app.env
+        # all the added and changed notebooks should be operated on.
+        # note docnames are paths relative to the sphinx root folder, with no extensions
+        # (this is only needed here, since it requires a file lookup per docname)
+        exec_docnames = [
+            docname for docname in added | changed if is_valid_exec_file(env, docname)
+        ]
+        LOGGER.verbose("MyST-NB: Potential docnames to execute: %s", exec_docnames)
+
+        env.nb_path_to_cache = str(
+            config["jupyter_cache"]
             or Path(app.outdir).parent.joinpath(".jupyter_cache")
         )
 
-        cache_base = get_cache(app.env.nb_path_to_cache)
+        cache_base = get_cache_base(env.nb_path_to_cache)
+        execution_data = env.nb_execution_data
+        exec_suffixes = env.nb_allowed_exec_suffixes
         for path in removed:
 
-            if path in app.env.nb_execution_data:
-                app.env.nb_execution_data_changed = True
-                app.env.nb_execution_data.pop(path, None)
+            if path in execution_data:
+                env.nb_execution_data_changed = True
+                execution_data.pop(path, None)
 
-            docpath = app.env.doc2path(path)
+            docpath = env.doc2path(path)
             # there is an issue in sphinx doc2path, whereby if the path does not
             # exist then it will be assigned the default source_suffix (usually .rst)
             # therefore, to be safe here, we run through all possible suffixes
-            for suffix in app.env.nb_allowed_exec_suffixes:
+            for suffix in exec_suffixes:
                 docpath = os.path.splitext(docpath)[0] + suffix
                 if not os.path.exists(docpath):
                     cache_base.discard_staged_notebook(docpath)
 
         _stage_and_execute(
-            env=app.env,
+            env=env,
             exec_docnames=exec_docnames,
-            path_to_cache=app.env.nb_path_to_cache,
-            timeout=app.config["execution_timeout"],
-            allow_errors=app.config["execution_allow_errors"],
-            exec_in_temp=app.config["execution_in_temp"],
+            path_to_cache=env.nb_path_to_cache,
+            timeout=config["execution_timeout"],
+            allow_errors=config["execution_allow_errors"],
+            exec_in_temp=config["execution_in_temp"],
+            max_workers=app.parallel,
         )
 
     return []
@@ -114,21 +128,23 @@ def generate_notebook_outputs(
 
     if not path_to_cache:
 
-        if execution_method == "auto" and nb_has_all_output(file_path):
+        if execution_method == "auto" and nb_has_all_output(file_path, ntbk=ntbk):
             LOGGER.info(
                 "Did not execute %s. "
                 "Set jupyter_execute_notebooks to `force` to execute",
                 env.docname,
             )
         else:
+            timeout = env.config["execution_timeout"]
+            allow_errors = env.config["execution_allow_errors"]
             if env.config["execution_in_temp"]:
                 with tempfile.TemporaryDirectory() as tmpdirname:
                     LOGGER.info("Executing: %s in temporary directory", env.docname)
                     result = single_nb_execution(
                         ntbk,
                         cwd=tmpdirname,
-                        timeout=env.config["execution_timeout"],
-                        allow_errors=env.config["execution_allow_errors"],
+                        timeout=timeout,
+                        allow_errors=allow_errors,
                     )
             else:
                 cwd = Path(file_path).parent
@@ -136,8 +152,8 @@ def generate_notebook_outputs(
                 result = single_nb_execution(
                     ntbk,
                     cwd=cwd,
-                    timeout=env.config["execution_timeout"],
-                    allow_errors=env.config["execution_allow_errors"],
+                    timeout=timeout,
+                    allow_errors=allow_errors,
                 )
 
             report_path = None
@@ -165,9 +181,10 @@ def generate_notebook_outputs(
 
         return ntbk
 
-    cache_base = get_cache(path_to_cache)
+    cache_base = get_cache_base(path_to_cache)
     # Use relpath here in case Sphinx is building from a non-parent folder
-    r_file_path = Path(os.path.relpath(file_path, Path().resolve()))
+    # (relative to the working directory, without resolving every path component)
+    r_file_path = Path(os.path.relpath(file_path))
 
     # default execution data
     runtime = None
@@ -220,6 +237,23 @@ def generate_notebook_outputs(
     return ntbk
 
 
+def get_cache_base(path_to_cache: str) -> JupyterCacheAbstract:
+    """Get the jupyter-cache for this path.
+
+    The cache is reused for all calls within a build and process
+    (e.g. for each notebook read),
+    rather than re-initialising its database connection every time.
+    """
+    return _get_cache_base(path_to_cache, os.getpid())
+
+
+@lru_cache(maxsize=8)
+def _get_cache_base(path_to_cache: str, pid: int) -> JupyterCacheAbstract:
+    # the process id is part of the key, since database connections
+    # should not be shared with forked (parallel build) processes
+    return get_cache(path_to_cache)
+
+
 def is_valid_exec_file(env: BuildEnvironment, docname: str) -> bool:
     """Check if the docname refers to a file that should be executed."""
     doc_path = env.doc2path(docname)
@@ -256,16 +290,23 @@ def _stage_and_execute(
     timeout: Optional[int],
     allow_errors: bool,
     exec_in_temp: bool,
+    max_workers: int = 1,
 ):
     pk_list = []
-    cache_base = get_cache(path_to_cache)
-
-    for nb in exec_docnames:
-        source_path = env.doc2path(nb)
-        with open(source_path, encoding="utf8") as handle:
-            # here we pass an iterator, so that only the required lines are read
-            converter = get_nb_converter(source_path, env, (line for line in handle))
-        if converter is not None:
+    cache_base = get_cache_base(path_to_cache)
+
+    # probing the files is I/O bound, and so is run concurrently,
+    # but staging must be serial, since it writes to the cache database
+    doc2path = env.doc2path
+    source_paths = [doc2path(nb) for nb in exec_docnames]
+    probe_workers = min(32, (os.cpu_count() or 1) * 4, len(source_paths) or 1)
+    with ThreadPoolExecutor(max_workers=probe_workers) as pool:
+        is_notebook = list(
+            pool.map(lambda path: _is_notebook_file(path, env), source_paths)
+        )
+
+    for source_path, stage in zip(source_paths, is_notebook):
+        if stage:
             stage_record = cache_base.stage_notebook_file(source_path)
             pk_list.append(stage_record.pk)
 
@@ -279,6 +320,7 @@ def _stage_and_execute(
                 exec_in_temp=exec_in_temp,
                 allow_errors=allow_errors,
                 env=env,
+                max_workers=max_workers,
             )
     except OSError as err:
         # This is a 'fix' for obscure cases, such as if you
@@ -294,6 +336,14 @@ def _stage_and_execute(
             cache_base.discard_staged_notebook(record.pk)
 
 
+def _is_notebook_file(source_path: str, env: BuildEnvironment) -> bool:
+    """Check if the file can be converted to a notebook."""
+    with open(source_path, encoding="utf8") as handle:
+        # here we pass an iterator, so that only the required lines are read
+        converter = get_nb_converter(source_path, env, (line for line in handle))
+    return converter is not None
+
+
 def execute_staged_nb(
     cache_base,
     pk_list,
@@ -301,13 +351,22 @@ def execute_staged_nb(
     exec_in_temp: bool,
     allow_errors: bool,
     env: BuildEnvironment,
+    max_workers: int = 1,
 ):
-    """Executing the staged notebook."""
-    try:
-        executor = load_executor("basic", cache_base, logger=LOGGER)
-    except ImportError as error:
-        LOGGER.error(str(error))
-        return 1
+    """Executing the staged notebook.
+
+    :param max_workers: the maximum number of notebooks to execute concurrently
+    """
+    if max_workers > 1:
+        executor = JupyterExecutorParallel(
+            cache_base, logger=LOGGER, max_workers=max_workers
+        )
+    else:
+        try:
+            executor = load_executor("basic", cache_base, logger=LOGGER)
+        except ImportError as error:
+            LOGGER.error(str(error))
+            return 1
 
     def _converter(path):
         text = Path(path).read_text(encoding="utf8")
@@ -323,17 +382,67 @@ def execute_staged_nb(
     return result
 
 
-def nb_has_all_output(source_path: str, nb_extensions: List[str] = (".ipynb",)) -> bool:
-    """Determine if the path contains a notebook with at least one output."""
-    has_outputs = False
-    ext = os.path.splitext(source_path)[1]
+class JupyterExecutorParallel(JupyterExecutorBasic):
+    """An executor that runs multiple notebooks concurrently.
+
+    As with the basic executor, all access to the cache is serial,
+    only the execution of each notebook (in its own kernel) is run in a thread.
+    """
 
-    if ext in nb_extensions:
-        with open(source_path, "r", encoding="utf8") as f:
-            ntbk = nbf.read(f, as_version=4)
-            has_outputs = all(
-                len(cell.outputs) != 0
-                for cell in ntbk.cells
-                if cell["cell_type"] == "code"
+    def __init__(self, cache, logger=None, max_workers: int = 2):
+        super().__init__(cache, logger=logger)
+        self._max_workers = max_workers
+
+    def execute(self, input_iterator, timeout=30, allow_errors=False, in_temp=True):
+        def _execute(item):
+            # the generator is left suspended after its result,
+            # so that any temporary directory remains until the result is cached
+            runner = JupyterExecutorBasic.execute(
+                self, iter([item]), timeout, allow_errors, in_temp
             )
-    return has_outputs
+            return runner, next(runner)
+
+        # items are only pulled from the iterator as a worker becomes free,
+        # since each holds a notebook read from the cache
+        input_iterator = iter(input_iterator)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            pending = {
+                pool.submit(_execute, item)
+                for item in islice(input_iterator, self._max_workers)
+            }
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    runner, result = future.result()
+                    yield result
+                    runner.close()
+                    for item in islice(input_iterator, 1):
+                        pending.add(pool.submit(_execute, item))
+
+
+def nb_has_all_output(
+    source_path: str,
+    nb_extensions: List[str] = (".ipynb",),
+    ntbk: Optional[nbf.NotebookNode] = None,
+) -> bool:
+    """Determine if the path contains a notebook with at least one output.
+
+    :param ntbk: the notebook already read from ``source_path``, if available,
+        in which case the file is not re-read
+    """
+    ext = os.path.splitext(source_path)[1]
+    if ext not in nb_extensions:
+        return False
+
+    if ntbk is not None:
+        cells = ntbk.cells
+    else:
+        # we only need the cell types and outputs,
+        # so parse the raw bytes, rather than running the full nbformat validation
+        data = json.loads(Path(source_path).read_bytes())
+        if data.get("nbformat", NOTEBOOK_VERSION) < NOTEBOOK_VERSION:
+            data = nbf.convert(nbf.from_dict(data), NOTEBOOK_VERSION)
+        cells = data.get("cells", [])
+
+    # exits on the first code cell with no outputs
+    return all(cell.get("outputs") for cell in cells if cell.get("cell_type") == "code")
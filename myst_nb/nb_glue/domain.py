@@ -1,8 +1,12 @@
 import copy
+import hashlib
 import json
+import os
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, cast
+from typing import Dict, List, Optional, Tuple, cast
 
+import nbformat as nbf
 from docutils import nodes
 from docutils.parsers.rst import directives
 from sphinx.domains import Domain
@@ -28,15 +32,22 @@ class PasteNode(nodes.container):
     def key(self):
         return self.attributes["key"]
 
-    def copy(self):
-        obj = self.__class__(
-            self.key, **{k: v for k, v in self.attributes.items() if k != "key"}
-        )
-        obj.document = self.document
-        obj.source = self.source
-        obj.line = self.line
+    def __copy__(self):
+        """Copy the node (without children), bypassing ``__init__``."""
+        obj = self.__class__.__new__(self.__class__)
+        obj.__dict__.update(self.__dict__)
+        obj.parent = None
+        obj.children = []
+        # as in ``Element.__init__``, list attributes are copied for the new node
+        obj.attributes = {
+            k: v[:] if k in self.list_attributes else v
+            for k, v in self.attributes.items()
+        }
         return obj
 
+    def copy(self):
+        return copy.copy(self)
+
     def create_node(self, output: dict, document, env):
         """Create the output node, give the cell output."""
         # the whole output chunk is deposited and rendered later
@@ -58,6 +69,28 @@ class PasteInlineNode(PasteNode):
         return inline_node
 
 
+def _format_text(text: str, formatting: Optional[str]) -> str:
+    """Format the plain text of an output, for pasting."""
+    text = text.strip("'")
+    # If formatting is specified, see if we have a number of some kind
+    if formatting:
+        text = _format_number(text, formatting)
+    return text
+
+
+@lru_cache(maxsize=4096)
+def _format_number(text: str, formatting: str) -> str:
+    """Format the text as a number, if it can be converted to one.
+
+    This is cached, since the same (often numeric) values are commonly pasted
+    many times across a project, e.g. in tables.
+    """
+    try:
+        return f"{float(text):>{formatting}}"
+    except ValueError:
+        return text
+
+
 class PasteTextNode(PasteNode):
     """A subclass of ``PasteNode`` that only supports plain text."""
 
@@ -69,14 +102,7 @@ class PasteTextNode(PasteNode):
         """Create the output node, give the cell output."""
         mimebundle = output["data"]
         if "text/plain" in mimebundle:
-            text = mimebundle["text/plain"].strip("'")
-            # If formatting is specified, see if we have a number of some kind
-            if self.formatting:
-                try:
-                    newtext = float(text)
-                    text = f"{newtext:>{self.formatting}}"
-                except ValueError:
-                    pass
+            text = _format_text(mimebundle["text/plain"], self.formatting)
             node = nodes.inline(text, text, classes=["pasted-text"])
             node.source, node.line = self.source, self.line
             return node
@@ -158,18 +184,23 @@ class PasteMath(Paste):
         return target
 
 
-class PasteFigure(Paste):
-    def align(argument):
-        return directives.choice(argument, ("left", "center", "right"))
+def _figure_align(argument):
+    return directives.choice(argument, ("left", "center", "right"))
 
-    def figwidth_value(argument):
-        return directives.length_or_percentage_or_unitless(argument, "px")
 
-    option_spec = Paste.option_spec.copy()
-    option_spec["figwidth"] = figwidth_value
-    option_spec["figclass"] = directives.class_option
-    option_spec["align"] = align
-    option_spec["name"] = directives.unchanged
+def _figure_width(argument):
+    return directives.length_or_percentage_or_unitless(argument, "px")
+
+
+class PasteFigure(Paste):
+
+    option_spec = {
+        **Paste.option_spec,
+        "figwidth": _figure_width,
+        "figclass": directives.class_option,
+        "align": _figure_align,
+        "name": directives.unchanged,
+    }
     has_content = True
 
     def run(self):
@@ -248,17 +279,33 @@ def paste_text_role(name, rawtext, text, lineno, inliner, options=None, content=
     return [PasteTextNode(key, formatting=formatting, location=(path, lineno))], []
 
 
+@lru_cache(maxsize=128)
+def _read_output(path: str) -> Tuple[dict, dict]:
+    """Read a glue output from disc,
+    and its data with the `glue` specific prefix removed from the mimetypes.
+
+    Outputs are stored by content hash, so a path always refers to the same output.
+    The results are shared between calls, and should not be mutated.
+    """
+    # the JSON parser decodes the raw bytes directly, skipping a text-mode read
+    output = json.loads(Path(path).read_bytes())
+    data = {mime.replace(GLUE_PREFIX, ""): val for mime, val in output["data"].items()}
+    return output, data
+
+
 class NbGlueDomain(Domain):
     """A sphinx domain for handling glue data """
 
     name = "glue"
     label = "NotebookGlue"
     # data version, bump this when the format of self.data changes
-    data_version = 0.1
+    data_version = 0.4
     # data value for a fresh environment
-    # - cache is the mapping of all keys to outputs
+    # - cache is the mapping of all keys to a reference to their output,
+    #   the outputs themselves are stored on disc, in the `outputs_dir`
     # - docmap is the mapping of docnames to the set of keys it contains
-    initial_data = {"cache": {}, "docmap": {}}
+    # - key_to_doc is the inverse of docmap, mapping all keys to their docname
+    initial_data = {"cache": {}, "docmap": {}, "key_to_doc": {}}
 
     directives = {"": Paste, "any": Paste, "figure": PasteFigure, "math": PasteMath}
 
@@ -266,25 +313,37 @@ class NbGlueDomain(Domain):
 
     @property
     def cache(self) -> dict:
-        return self.env.domaindata[self.name]["cache"]
+        return self.data["cache"]
 
     @property
     def docmap(self) -> dict:
-        return self.env.domaindata[self.name]["docmap"]
+        return self.data["docmap"]
+
+    @property
+    def key_to_doc(self) -> dict:
+        return self.data["key_to_doc"]
+
+    @property
+    def outputs_dir(self) -> Path:
+        return Path(self.env.doctreedir).joinpath("glue_outputs")
 
     def __contains__(self, key):
         return key in self.cache
 
+    def _output_path(self, key) -> Path:
+        return self.outputs_dir.joinpath(f"{self.cache[key]['sha']}.json")
+
+    def _read_output(self, key) -> Tuple[dict, dict]:
+        return _read_output(str(self._output_path(key)))
+
     def get(self, key, view=True, replace=True):
-        """Grab the output for this key and replace `glue` specific prefix info."""
-        output = self.cache.get(key)
-        if view:
-            output = copy.deepcopy(output)
-        if replace:
-            output["data"] = {
-                key.replace(GLUE_PREFIX, ""): val for key, val in output["data"].items()
-            }
-        return output
+        """Grab the output for this key and replace `glue` specific prefix info.
+
+        The output is read from disc, and a copy owned by the caller is returned
+        (``view`` is kept for backwards compatibility).
+        """
+        output, data = self._read_output(key)
+        return nbf.from_dict(dict(output, data=data if replace else output["data"]))
 
     @classmethod
     def from_env(cls, env) -> "NbGlueDomain":
@@ -296,40 +355,85 @@ class NbGlueDomain(Domain):
             path = Path(self.env.doctreedir).joinpath("glue_cache.json")
         if isinstance(path, str):
             path = Path(path)
+        # the JSON is written progressively, copying the stored outputs verbatim,
+        # so that all the outputs are never loaded into memory at once
         with path.open("w", encoding="utf8") as handle:
-            json.dump(
-                {
-                    d: {k: self.cache[k] for k in vs if k in self.cache}
-                    for d, vs in self.docmap.items()
-                    if vs
-                },
-                handle,
-                indent=2,
-            )
+            handle.write("{")
+            doc_sep = "\n"
+            for docname, keys in self.docmap.items():
+                if not keys:
+                    continue
+                handle.write(f"{doc_sep}{json.dumps(docname)}: {{")
+                key_sep = "\n"
+                for key in keys:
+                    if key not in self.cache:
+                        continue
+                    handle.write(f"{key_sep}{json.dumps(key)}: ")
+                    handle.write(self._output_path(key).read_text(encoding="utf8"))
+                    key_sep = ",\n"
+                handle.write("\n}")
+                doc_sep = ",\n"
+            handle.write("\n}\n")
 
     def add_notebook(self, ntbk, docname):
         """Find all glue keys from the notebook and add to the cache."""
+        docname = str(docname)
+        for key in self.docmap.get(docname, []):
+            self.key_to_doc.pop(key, None)
         new_keys = find_all_keys(
             ntbk,
-            existing_keys={v: k for k, vs in self.docmap.items() for v in vs},
-            path=str(docname),
+            existing_keys=self.key_to_doc,
+            path=docname,
             logger=SPHINX_LOGGER,
         )
-        self.docmap[str(docname)] = set(new_keys)
-        self.cache.update(new_keys)
+        self.docmap[docname] = set(new_keys)
+        self.key_to_doc.update(dict.fromkeys(new_keys, docname))
+        self.outputs_dir.mkdir(parents=True, exist_ok=True)
+        for key, output in new_keys.items():
+            text = json.dumps(output, sort_keys=True)
+            sha = hashlib.sha1(text.encode("utf8")).hexdigest()
+            path = self.outputs_dir.joinpath(f"{sha}.json")
+            if not path.exists():
+                # write then rename, so that the file is never read part written
+                temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                temp_path.write_text(text, encoding="utf8")
+                os.replace(str(temp_path), str(path))
+            self.cache[key] = {"sha": sha}
 
     def clear_doc(self, docname: str) -> None:
         """Remove traces of a document in the domain-specific inventories."""
         for key in self.docmap.get(docname, []):
             self.cache.pop(key, None)
+            self.key_to_doc.pop(key, None)
         self.docmap.pop(docname, None)
 
+    def remove_unused_outputs(self) -> None:
+        """Remove outputs on disc, that are no longer referenced by any key."""
+        if not self.outputs_dir.is_dir():
+            return
+        used = {f"{ref['sha']}.json" for ref in self.cache.values()}
+        for path in self.outputs_dir.glob("*.json"):
+            if path.name not in used:
+                path.unlink()
+
     def merge_domaindata(self, docnames: List[str], otherdata: Dict) -> None:
         """Merge in data regarding *docnames* from a different domaindata
         inventory (coming from a subprocess in parallel builds).
         """
-        # TODO need to deal with key clashes
-        raise NotImplementedError(
-            "merge_domaindata must be implemented in %s "
-            "to be able to do parallel builds!" % self.__class__
-        )
+        for docname in docnames:
+            if docname not in otherdata["docmap"]:
+                continue
+            keys = self.docmap[docname] = set()
+            for key in otherdata["docmap"][docname]:
+                # key clashes between documents read in different processes
+                # can only be found here, and are handled as for a serial build
+                if key in self.key_to_doc:
+                    SPHINX_LOGGER.warning(
+                        f"Skipping glue key `{key}`, "
+                        f"that already exists in: '{self.key_to_doc[key]}'",
+                        location=(docname, None),
+                    )
+                    continue
+                keys.add(key)
+                self.key_to_doc[key] = docname
+                self.cache[key] = otherdata["cache"][key]
@@ -140,7 +140,8 @@ def sphinx_params(request):
     if markers is not None:
         for info in reversed(list(markers)):
             kwargs.update(info.kwargs)
-            kwargs["files"] = info.args
+            if info.args:
+                kwargs["files"] = info.args
     return kwargs
 
 
@@ -155,6 +156,7 @@ def sphinx_run(sphinx_params, make_app, tempdir):
     assert len(sphinx_params["files"]) > 0, sphinx_params["files"]
     conf = sphinx_params.get("conf", {})
     buildername = sphinx_params.get("buildername", "html")
+    parallel = sphinx_params.get("parallel", 0)
 
     confoverrides = {
         "extensions": ["myst_nb"],
@@ -189,7 +191,12 @@ def sphinx_run(sphinx_params, make_app, tempdir):
         (srcdir / nb_file).write_text(nb_path.read_text(encoding="utf8"))
 
     nocolor()
-    app = make_app(buildername=buildername, srcdir=srcdir, confoverrides=confoverrides)
+    app = make_app(
+        buildername=buildername,
+        srcdir=srcdir,
+        confoverrides=confoverrides,
+        parallel=parallel,
+    )
 
     yield SphinxFixture(app, sphinx_params["files"])
 
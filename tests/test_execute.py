@@ -1,6 +1,11 @@
 import os
+import shutil
 
+import nbformat as nbf
 import pytest
+from jupyter_cache.executors.basic import JupyterExecutorBasic
+
+from myst_nb.execution import JupyterExecutorParallel, nb_has_all_output
 
 
 def regress_nb_doc(file_regression, sphinx_run, check_nbs):
@@ -61,6 +66,19 @@ def test_rebuild_cache(sphinx_run):
     assert "Executing" not in sphinx_run.status(), sphinx_run.status()
 
 
+@pytest.mark.sphinx_params(
+    "basic_unrun.ipynb", conf={"jupyter_execute_notebooks": "cache"}
+)
+def test_rebuild_cache_removed(sphinx_run):
+    """The cache folder may be removed between builds."""
+    sphinx_run.build()
+    shutil.rmtree(sphinx_run.env.nb_path_to_cache)
+    sphinx_run.invalidate_files()
+    sphinx_run.build()
+    assert "Executing" in sphinx_run.status(), sphinx_run.status()
+    assert sphinx_run.env.nb_execution_data["basic_unrun"]["succeeded"] is True
+
+
 @pytest.mark.sphinx_params(
     "basic_unrun.ipynb", conf={"jupyter_execute_notebooks": "force"}
 )
@@ -301,3 +319,69 @@ def test_custom_convert_cache(sphinx_run, file_regression, check_nbs):
     assert "custom-formats" in sphinx_run.env.nb_execution_data
     assert sphinx_run.env.nb_execution_data["custom-formats"]["method"] == "cache"
     assert sphinx_run.env.nb_execution_data["custom-formats"]["succeeded"] is True
+
+
+@pytest.mark.parametrize(
+    "executor_type",
+    [
+        pytest.param(
+            JupyterExecutorBasic, marks=pytest.mark.sphinx_params(parallel=0), id="0"
+        ),
+        pytest.param(
+            JupyterExecutorBasic, marks=pytest.mark.sphinx_params(parallel=1), id="1"
+        ),
+        pytest.param(
+            JupyterExecutorParallel, marks=pytest.mark.sphinx_params(parallel=2), id="2"
+        ),
+    ],
+)
+@pytest.mark.sphinx_params(
+    "basic_unrun.ipynb",
+    "basic_run.ipynb",
+    conf={"jupyter_execute_notebooks": "cache"},
+)
+def test_execute_parallel(sphinx_run, monkeypatch, executor_type):
+    """Notebooks should only be executed concurrently in parallel builds."""
+    executors = []
+    execute = JupyterExecutorBasic.execute
+
+    def _execute(self, *args, **kwargs):
+        executors.append(type(self))
+        return execute(self, *args, **kwargs)
+
+    monkeypatch.setattr(JupyterExecutorBasic, "execute", _execute)
+    sphinx_run.build()
+    assert set(executors) == {executor_type}
+    for docname in ("basic_unrun", "basic_run"):
+        assert sphinx_run.env.nb_execution_data[docname]["succeeded"] is True
+
+
+def test_execute_parallel_bounded(monkeypatch):
+    """Notebooks should only be pulled from the input as a worker becomes free."""
+    pulled = []
+
+    def _execute(self, input_iterator, *args):
+        for item in input_iterator:
+            yield item
+
+    def _input_iterator():
+        for item in range(6):
+            pulled.append(item)
+            yield item
+
+    monkeypatch.setattr(JupyterExecutorBasic, "execute", _execute)
+    executor = JupyterExecutorParallel(None, max_workers=2)
+    results = []
+    for result in executor.execute(_input_iterator()):
+        assert len(pulled) <= len(results) + 2
+        results.append(result)
+    assert sorted(results) == list(range(6))
+
+
+def test_nb_has_all_output(get_test_path):
+    assert nb_has_all_output(str(get_test_path("basic_run.ipynb")))
+    assert not nb_has_all_output(str(get_test_path("basic_unrun.ipynb")))
+    assert not nb_has_all_output(str(get_test_path("basic_unrun.md")))
+    # an already read notebook is used in place of the file
+    ntbk = nbf.read(str(get_test_path("basic_unrun.ipynb")), nbf.NO_CONVERT)
+    assert not nb_has_all_output(str(get_test_path("basic_run.ipynb")), ntbk=ntbk)
@@ -1,9 +1,16 @@
+import copy
+
 import pytest
 from IPython.core.displaypub import DisplayPublisher
 from IPython.core.interactiveshell import InteractiveShell
 
 from myst_nb.nb_glue import glue, utils
-from myst_nb.nb_glue.domain import NbGlueDomain
+from myst_nb.nb_glue.domain import (
+    NbGlueDomain,
+    PasteTextNode,
+    _format_number,
+    _format_text,
+)
 from myst_nb.nb_glue.transform import PasteNodesToDocutils
 from myst_nb.render_outputs import CellOutputsToNodes
 
@@ -83,6 +90,30 @@ def test_glue_func_obj_no_display(mock_ipython):
     ]
 
 
+def test_paste_node_copy():
+    node = PasteTextNode("key", formatting=".2f", classes=["a"])
+    node.source, node.line = "source", 1
+    node_copy = node.copy()
+    assert isinstance(node_copy, PasteTextNode)
+    assert (node_copy.key, node_copy.formatting) == ("key", ".2f")
+    assert (node_copy.source, node_copy.line) == ("source", 1)
+    node_copy["classes"].append("b")
+    assert node["classes"] == ["a"]
+
+
+def test_format_text():
+    _format_number.cache_clear()
+    # without formatting, the text is only unquoted, and nothing is cached
+    assert _format_text("'text1'", None) == "text1"
+    assert _format_text("3.14159", "") == "3.14159"
+    assert _format_number.cache_info().currsize == 0
+    # with formatting, numbers are formatted, and other text is left as is
+    assert _format_text("3.14159", ".2f") == "3.14"
+    assert _format_text("'text1'", ".2f") == "text1"
+    assert _format_text("3.14159", ".2f") == "3.14"
+    assert _format_number.cache_info().hits == 1
+
+
 def test_find_glued_key(get_test_path):
 
     bundle = utils.find_glued_key(get_test_path("with_glue.ipynb"), "key_text1")
@@ -120,6 +151,59 @@ def test_parser(sphinx_run, clean_doctree, file_regression):
         "key_plt",
         "sym_eq",
     }
+    assert glue_domain.get("key_undisplayed")["data"] == {"text/plain": "'undisplayed'"}
+    assert "application/papermill.record/text/plain" in (
+        glue_domain.get("key_undisplayed", replace=False)["data"]
+    )
+    # nested mappings are notebook nodes, for attribute access in renderers
+    assert glue_domain.get("key_float").metadata.scrapbook.name == "key_float"
+    glue_cache = utils.read_glue_cache(sphinx_run.app.env.doctreedir)
+    assert set(glue_cache["with_glue"]) == set(glue_domain.cache)
+    assert glue_cache["with_glue"]["key_float"] == glue_domain.get(
+        "key_float", replace=False
+    )
+    # outputs are stored on disc, rather than in the environment
+    assert len(list(glue_domain.outputs_dir.glob("*.json"))) == 6
     glue_domain.clear_doc("with_glue")
     assert glue_domain.cache == {}
     assert glue_domain.docmap == {}
+    assert glue_domain.key_to_doc == {}
+    glue_domain.remove_unused_outputs()
+    assert list(glue_domain.outputs_dir.glob("*.json")) == []
+
+
+@pytest.mark.sphinx_params("with_glue.ipynb", conf={"jupyter_execute_notebooks": "off"})
+def test_merge_domaindata(sphinx_run):
+    sphinx_run.build()
+    glue_domain = NbGlueDomain.from_env(sphinx_run.app.env)
+    otherdata = copy.deepcopy(glue_domain.data)
+    glue_domain.clear_doc("with_glue")
+    glue_domain.merge_domaindata(["with_glue"], otherdata)
+    assert glue_domain.data == otherdata
+    # the same keys in a document from another process are skipped
+    otherdata["docmap"]["other"] = otherdata["docmap"].pop("with_glue")
+    glue_domain.merge_domaindata(["other"], otherdata)
+    assert glue_domain.docmap["other"] == set()
+    assert "Skipping glue key `key_float`" in sphinx_run.warnings()
+
+
+@pytest.mark.sphinx_params(
+    "with_glue.ipynb",
+    # documents are read in (sorted) chunks, one per process,
+    # so the keys are glued and pasted in different processes
+    "basic_glue_paste.md",
+    "basic_nometadata.md",
+    "basic_run.ipynb",
+    "basic_stderr.ipynb",
+    "complex_outputs.ipynb",
+    conf={"jupyter_execute_notebooks": "off"},
+    parallel=2,
+)
+def test_parallel_paste(sphinx_run):
+    """Keys glued in one document should be pasted in another, in parallel builds."""
+    sphinx_run.build()
+    assert "waiting for workers" in sphinx_run.status()
+    assert "Couldn't find key" not in sphinx_run.warnings()
+    text = sphinx_run.get_resolved_doctree("basic_glue_paste").astext()
+    assert "text1" in text
+    assert "3.14" in text